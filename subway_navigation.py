@@ -1,4 +1,6 @@
 import copy
+import csv
+import math
 
 
 class Matrix:
@@ -223,31 +225,8 @@ class Graph:
         return path[::-1]
 
     def find_shortest_path_weight(self, start, end):
-        vertices_count = len(self.data)
-        distances = {i: float("inf") for i in range(vertices_count)}
-        distances[start] = 0
-        visited = [False] * vertices_count
-        parent = {start: None}
-        for _ in range(vertices_count):
-            min_dist = float("inf")
-            curr = -1
-            for i in range(vertices_count):
-                if not visited[i] and distances[i] < min_dist:
-                    min_dist = distances[i]
-                    curr = i
-            if curr == -1 or distances[curr] == float("inf"):
-                break
-            if curr == end:
-                break
-            visited[curr] = True
-            for i in range(vertices_count):
-                weight = self.data[curr][i]
-                if weight > 0 and not visited[i]:
-                    new_dist = distances[curr] + weight
-                    if new_dist < distances[i]:
-                        distances[i] = new_dist
-                        parent[i] = curr
-        if end not in parent:
+        distances, parent, _ = self.shortest_path_tree(start, target=end)
+        if distances[end] == float("inf"):
             return None, float("inf")
         path = []
         curr_node = end
@@ -341,6 +320,57 @@ class Graph:
                                 return False
         return True
 
+    def shortest_path_tree(self, start, target=None):
+        vertices_count = len(self.data)
+        distances = [float("inf")] * vertices_count
+        distances[start] = 0
+        visited = [False] * vertices_count
+        parent = [None] * vertices_count
+        order = []
+        for _ in range(vertices_count):
+            min_dist = float("inf")
+            curr = -1
+            for i in range(vertices_count):
+                if not visited[i] and distances[i] < min_dist:
+                    min_dist = distances[i]
+                    curr = i
+            if curr == -1 or distances[curr] == float("inf"):
+                break
+            visited[curr] = True
+            order.append(curr)
+            if curr == target:
+                break
+            for i in range(vertices_count):
+                weight = self.data[curr][i]
+                if weight > 0 and not visited[i]:
+                    new_dist = distances[curr] + weight
+                    if new_dist < distances[i]:
+                        distances[i] = new_dist
+                        parent[i] = curr
+        return distances, parent, order
+
+    def assign_demand(self, od_demand):
+        # od_demand: {origin: {destination: volume}}
+        # One shortest path tree per origin, flows pushed back up the tree
+        # in reverse settle order, so every child is summed before its parent.
+        vertices_count = len(self.data)
+        loads = {}
+        unassigned = 0
+        for origin, destinations in od_demand.items():
+            distances, parent, order = self.shortest_path_tree(origin)
+            flow = [0] * vertices_count
+            for dest, volume in destinations.items():
+                if distances[dest] == float("inf"):
+                    unassigned += volume
+                else:
+                    flow[dest] += volume
+            for v in reversed(order):
+                u = parent[v]
+                if u is not None and flow[v] != 0:
+                    loads[(u, v)] = loads.get((u, v), 0) + flow[v]
+                    flow[u] += flow[v]
+        return loads, unassigned
+
 
 subway_data_source = {
     "1号线": "苹果园-3-古城-2-八角游乐园-2-八宝山-2-玉泉路-2-五棵松-2-万寿路-2-公主坟-2-军事博物馆-2-木樨地-2-南礼士路-2-复兴门-2-西单-2-天安门西-2-天安门东-2-王府井-2-东单-2-建国门-2-永安里-2-国贸-2-大望路-2-四惠-2-四惠东-3-高碑店-2-传媒大学-2-双桥-2-管庄-2-八里桥-3-通州北苑-2-果园-2-九棵树-2-梨园-2-临河里-2-土桥-2-花庄-2-环球度假区",
@@ -509,11 +539,57 @@ class BeijingSubwaySystem:
             matrix_data[vi][ui] = t
 
         self.graph = Graph(matrix_data)
+        self.baseline_data = copy.deepcopy(matrix_data)
         print(f"Initialization Complete! Loaded {self.n} stations and {self.graph.count_edges() // 2} track segments.")
 
     def get_station_id(self, name):
         return self.name_to_idx.get(name)
 
+    def read_demand(self, file_path, stats):
+        # Yields (origin_id, destination_id, volume) one CSV row at a time.
+        # Rows with unknown stations, a bad volume or origin == destination are
+        # counted in stats["skipped"]; a non-numeric header row is ignored.
+        with open(file_path, encoding="utf-8-sig", newline="") as f:
+            first_row = True
+            for row in csv.reader(f):
+                if not row or row[0].startswith("#"):
+                    continue
+                is_header, first_row = first_row, False
+                if len(row) < 3:
+                    stats["skipped"] += 1
+                    continue
+                o_id = self.get_station_id(row[0].strip())
+                d_id = self.get_station_id(row[1].strip())
+                try:
+                    volume = float(row[2])
+                except ValueError:
+                    if not is_header:
+                        stats["skipped"] += 1
+                    continue
+                if (
+                    o_id is None
+                    or d_id is None
+                    or o_id == d_id
+                    or not math.isfinite(volume)
+                    or volume <= 0
+                ):
+                    stats["skipped"] += 1
+                    continue
+                yield o_id, d_id, volume
+
+    def group_demand_by_origin(self, records):
+        # Memory is bounded by the number of OD pairs, not by the number of records.
+        od_demand = {}
+        for o_id, d_id, volume in records:
+            destinations = od_demand.setdefault(o_id, {})
+            destinations[d_id] = destinations.get(d_id, 0) + volume
+        return od_demand
+
+    def print_loads(self, loads, limit=10):
+        ranked = sorted(loads.items(), key=lambda item: abs(item[1]), reverse=True)
+        for (u, v), load in ranked[:limit]:
+            print(f"{self.idx_to_name[u]} -> {self.idx_to_name[v]}: {load:,.1f}")
+
     def print_path(self, path_indices, detail_type="simple"):
         if not path_indices:
             print("No path found.")
@@ -546,6 +622,7 @@ class BeijingSubwaySystem:
             print("6. [Matrix] Algebraic Connectivity Path (CPX Experiment)")
             print("7. [Components] Check Network Connectivity")
             print("8. [Simulation] Simulate Line Disruption (Remove Edge)")
+            print("9. [Assignment] OD Demand Segment Load")
             print("0. Exit")
             print("=" * 50)
 
@@ -646,6 +723,43 @@ class BeijingSubwaySystem:
                     self.graph.remove_edge(v, u)
                     print("Line segment disrupted. Please replan route to see effects.")
 
+            elif choice == "9":
+                file_path = input("Enter OD demand file (origin,destination,volume): ")
+                stats = {"skipped": 0}
+                try:
+                    od_demand = self.group_demand_by_origin(
+                        self.read_demand(file_path, stats)
+                    )
+                except (OSError, UnicodeDecodeError, csv.Error) as e:
+                    print(f"Error: Cannot read demand file: {e}")
+                    continue
+                print(f"\nAssigning demand from {len(od_demand)} origins to fastest routes...")
+                if stats["skipped"]:
+                    print(f"{stats['skipped']} rows skipped (unknown station, invalid volume or same origin and destination)")
+                loads, unassigned = self.graph.assign_demand(od_demand)
+                print("Top loaded segments:")
+                self.print_loads(loads)
+                if unassigned:
+                    print(f"Unassigned demand (destination unreachable): {unassigned:,.1f}")
+
+                if self.graph.data != self.baseline_data:
+                    print("\nDisruption detected. Comparing with baseline network...")
+                    base_loads, base_unassigned = Graph(self.baseline_data).assign_demand(od_demand)
+                    diff = {}
+                    for seg in set(loads) | set(base_loads):
+                        delta = loads.get(seg, 0) - base_loads.get(seg, 0)
+                        if not math.isclose(delta, 0, abs_tol=1e-9):
+                            diff[seg] = delta
+                    if diff:
+                        print("Largest load changes vs baseline:")
+                        self.print_loads(diff)
+                    else:
+                        print("No segment load changes vs baseline.")
+                    unassigned_delta = unassigned - base_unassigned
+                    if math.isclose(unassigned_delta, 0, abs_tol=1e-9):
+                        unassigned_delta = 0
+                    print(f"Change in unassigned demand: {unassigned_delta:+,.1f}")
+
             else:
                 print("Invalid input.")
 
@@ -0,0 +1,81 @@
+import os
+import tempfile
+import unittest
+
+from subway_navigation import BeijingSubwaySystem, Graph
+
+
+class TestDemandAssignment(unittest.TestCase):
+    def setUp(self):
+        # 0 -1- 1 -1- 2, with a slower direct 0 -5- 2 track and an isolated vertex 3
+        self.graph = Graph(
+            [
+                [0, 1, 5, 0],
+                [1, 0, 1, 0],
+                [5, 1, 0, 0],
+                [0, 0, 0, 0],
+            ]
+        )
+
+    def test_shortest_path_tree(self):
+        distances, parent, order = self.graph.shortest_path_tree(0)
+        self.assertEqual(distances[:3], [0, 1, 2])
+        self.assertEqual(distances[3], float("inf"))
+        self.assertEqual(parent, [None, 0, 1, None])
+        self.assertEqual(order, [0, 1, 2])
+
+    def test_shortest_path_tree_stops_at_target(self):
+        _, _, order = self.graph.shortest_path_tree(0, target=1)
+        self.assertEqual(order, [0, 1])
+        self.assertEqual(self.graph.find_shortest_path_weight(0, 2), ([0, 1, 2], 2))
+
+    def test_assign_demand(self):
+        loads, unassigned = self.graph.assign_demand({0: {1: 10, 2: 5, 3: 7}, 2: {0: 3}})
+        self.assertEqual(loads, {(0, 1): 15, (1, 2): 5, (2, 1): 3, (1, 0): 3})
+        self.assertEqual(unassigned, 7)
+
+    def test_assign_demand_after_disruption(self):
+        self.graph.remove_edge(1, 2)
+        self.graph.remove_edge(2, 1)
+        loads, unassigned = self.graph.assign_demand({0: {2: 4}})
+        self.assertEqual(loads, {(0, 2): 4})
+        self.assertEqual(unassigned, 0)
+
+
+class TestDemandReading(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.system = BeijingSubwaySystem()
+
+    def read(self, content):
+        fd, path = tempfile.mkstemp(suffix=".csv")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(content)
+        try:
+            stats = {"skipped": 0}
+            od_demand = self.system.group_demand_by_origin(
+                self.system.read_demand(path, stats)
+            )
+        finally:
+            os.remove(path)
+        return od_demand, stats["skipped"]
+
+    def test_group_sums_duplicate_rows(self):
+        od_demand, skipped = self.read(
+            "# demand\norigin,destination,volume\n西直门,国贸,10\n西直门,国贸,2.5\n国贸,西直门,1\n"
+        )
+        xizhimen = self.system.get_station_id("西直门")
+        guomao = self.system.get_station_id("国贸")
+        self.assertEqual(od_demand, {xizhimen: {guomao: 12.5}, guomao: {xizhimen: 1}})
+        self.assertEqual(skipped, 0)
+
+    def test_invalid_rows_are_skipped(self):
+        od_demand, skipped = self.read(
+            "西直门,国贸,nan\n西直门,西直门,3\nfoo,国贸,1\n西直门,国贸,x\n西直门,国贸,-1\n"
+        )
+        self.assertEqual(od_demand, {})
+        self.assertEqual(skipped, 5)
+
+
+if __name__ == "__main__":
+    unittest.main()